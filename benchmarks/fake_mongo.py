@@ -0,0 +1,279 @@
+# fake_mongo.py
+import copy
+import threading
+from contextlib import ExitStack
+from unittest import mock
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+# Every module that binds `MongoDB` at import time and needs the stand-in.
+PATCH_TARGETS = (
+  "src.db.MongoDB",
+  "src.gematsu_scraper.MongoDB",
+  "src.metacritic_scraper.MongoDB",
+  "main.MongoDB",
+)
+
+_OPERATORS = {
+  "$eq": lambda value, arg: value == arg,
+  "$ne": lambda value, arg: value != arg,
+  "$gt": lambda value, arg: value is not None and value > arg,
+  "$gte": lambda value, arg: value is not None and value >= arg,
+  "$lt": lambda value, arg: value is not None and value < arg,
+  "$lte": lambda value, arg: value is not None and value <= arg,
+  "$in": lambda value, arg: value in arg,
+}
+
+
+def _matches(document: dict, query: dict) -> bool:
+  for field, condition in query.items():
+    if field == "$or":
+      if not any(_matches(document, clause) for clause in condition):
+        return False
+      continue
+    if field == "$and":
+      if not all(_matches(document, clause) for clause in condition):
+        return False
+      continue
+    value = document.get(field)
+    if isinstance(condition, dict) and condition and all(
+      key.startswith("$") for key in condition
+    ):
+      for operator, arg in condition.items():
+        if not _OPERATORS[operator](value, arg):
+          return False
+    elif value != condition:
+      return False
+  return True
+
+
+class UpdateResult:
+  def __init__(self, matched_count: int, modified_count: int, upserted_id=None):
+    self.matched_count = matched_count
+    self.modified_count = modified_count
+    self.upserted_id = upserted_id
+
+
+class DeleteResult:
+  def __init__(self, deleted_count: int):
+    self.deleted_count = deleted_count
+
+
+class InsertOneResult:
+  def __init__(self, inserted_id):
+    self.inserted_id = inserted_id
+
+
+class FakeCollection:
+  """In-memory collection implementing the subset of pymongo the app uses.
+
+  Every operation holds a lock, so single-document updates are atomic across
+  threads the way they are on a real server.
+  """
+
+  def __init__(self, name: str):
+    self.name = name
+    self.documents: list[dict] = []
+    self.unique_indexes: list[tuple[str, ...]] = []
+    self._lock = threading.RLock()
+
+  def _apply_update(self, document: dict, update: dict, inserting: bool = False) -> None:
+    for field, value in update.get("$set", {}).items():
+      document[field] = copy.deepcopy(value)
+    if inserting:
+      for field, value in update.get("$setOnInsert", {}).items():
+        document[field] = copy.deepcopy(value)
+    for field, value in update.get("$inc", {}).items():
+      document[field] = document.get(field, 0) + value
+    for field in update.get("$unset", {}):
+      document.pop(field, None)
+
+  def _check_unique(self, document: dict) -> None:
+    for fields in [("_id",), *self.unique_indexes]:
+      key = tuple(document.get(field) for field in fields)
+      for existing in self.documents:
+        if existing is not document and tuple(existing.get(f) for f in fields) == key:
+          raise DuplicateKeyError(f"E11000 duplicate key error {fields}: {key}")
+
+  def create_index(self, keys, unique: bool = False, **kwargs) -> str:
+    fields = tuple(field for field, _ in keys)
+    with self._lock:
+      if unique and fields not in self.unique_indexes:
+        seen = set()
+        for document in self.documents:
+          key = tuple(document.get(field) for field in fields)
+          if key in seen:
+            raise DuplicateKeyError(f"E11000 duplicate key error {fields}: {key}")
+          seen.add(key)
+        self.unique_indexes.append(fields)
+    return "_".join(f"{field}_1" for field in fields)
+
+  def insert_one(self, document: dict) -> InsertOneResult:
+    document.setdefault("_id", ObjectId())
+    with self._lock:
+      stored = copy.deepcopy(document)
+      self._check_unique(stored)
+      self.documents.append(stored)
+    return InsertOneResult(document["_id"])
+
+  def insert_many(self, documents: list[dict]) -> None:
+    for document in documents:
+      self.insert_one(document)
+
+  def find(self, query: dict | None = None, projection: dict | None = None):
+    query = query or {}
+    with self._lock:
+      matched = [copy.deepcopy(doc) for doc in self.documents if _matches(doc, query)]
+    if projection:
+      fields = {field for field, keep in projection.items() if keep} | {"_id"}
+      matched = [{k: v for k, v in doc.items() if k in fields} for doc in matched]
+    return iter(matched)
+
+  def aggregate(self, pipeline: list[dict], **kwargs):
+    """Run `$match`, `$sort` and `$group` (with `$push` / `$sum`) stages."""
+
+    def resolve(document, expression):
+      if isinstance(expression, str) and expression.startswith("$"):
+        return document.get(expression[1:])
+      if isinstance(expression, dict):
+        return {key: resolve(document, value) for key, value in expression.items()}
+      return expression
+
+    with self._lock:
+      documents = [copy.deepcopy(doc) for doc in self.documents]
+    for stage in pipeline:
+      (operator, spec), = stage.items()
+      if operator == "$match":
+        documents = [doc for doc in documents if _matches(doc, spec)]
+      elif operator == "$sort":
+        for field, direction in reversed(list(spec.items())):
+          documents.sort(key=lambda doc: doc.get(field), reverse=direction < 0)
+      elif operator == "$group":
+        groups: dict[str, dict] = {}
+        for doc in documents:
+          group_id = resolve(doc, spec["_id"])
+          group = groups.setdefault(repr(group_id), {"_id": group_id})
+          for field, accumulator in spec.items():
+            if field == "_id":
+              continue
+            (accumulator, expression), = accumulator.items()
+            if accumulator == "$push":
+              group.setdefault(field, []).append(resolve(doc, expression))
+            else:
+              group[field] = group.get(field, 0) + resolve(doc, expression)
+        documents = list(groups.values())
+      else:
+        raise NotImplementedError(operator)
+    return iter(documents)
+
+  def find_one(self, query: dict | None = None):
+    query = query or {}
+    with self._lock:
+      for doc in self.documents:
+        if _matches(doc, query):
+          return copy.deepcopy(doc)
+    return None
+
+  def count_documents(self, query: dict) -> int:
+    with self._lock:
+      return sum(1 for doc in self.documents if _matches(doc, query))
+
+  def _upsert(self, query: dict, update: dict) -> dict:
+    document = {
+      field: copy.deepcopy(value)
+      for field, value in query.items()
+      if not field.startswith("$") and not isinstance(value, dict)
+    }
+    self._apply_update(document, update, inserting=True)
+    document.setdefault("_id", ObjectId())
+    self._check_unique(document)
+    self.documents.append(document)
+    return document
+
+  def update_one(self, query: dict, update: dict, upsert: bool = False):
+    with self._lock:
+      for document in self.documents:
+        if _matches(document, query):
+          self._apply_update(document, update)
+          return UpdateResult(1, 1)
+      if not upsert:
+        return UpdateResult(0, 0)
+      document = self._upsert(query, update)
+      return UpdateResult(0, 0, document["_id"])
+
+  def find_one_and_update(
+    self, query: dict, update: dict, sort=None, upsert: bool = False, return_document=False
+  ):
+    with self._lock:
+      candidates = [doc for doc in self.documents if _matches(doc, query)]
+      for field, direction in reversed(sort or []):
+        candidates.sort(key=lambda doc: doc.get(field), reverse=direction < 0)
+      if candidates:
+        document = candidates[0]
+        before = copy.deepcopy(document)
+        self._apply_update(document, update)
+      elif upsert:
+        before = None
+        document = self._upsert(query, update)
+      else:
+        return None
+      # pymongo's ReturnDocument.AFTER is True
+      return copy.deepcopy(document) if return_document else before
+
+  def delete_many(self, query: dict) -> DeleteResult:
+    with self._lock:
+      kept = [doc for doc in self.documents if not _matches(doc, query)]
+      deleted = len(self.documents) - len(kept)
+      self.documents = kept
+    return DeleteResult(deleted)
+
+  def drop(self) -> None:
+    with self._lock:
+      self.documents = []
+      self.unique_indexes = []
+
+
+class FakeDatabase:
+  def __init__(self, name: str):
+    self.name = name
+    self._collections: dict[str, FakeCollection] = {}
+    self._lock = threading.Lock()
+
+  def __getitem__(self, name: str) -> FakeCollection:
+    with self._lock:
+      if name not in self._collections:
+        self._collections[name] = FakeCollection(name)
+      return self._collections[name]
+
+
+class FakeMongoDB:
+  """Drop-in replacement for `src.db.MongoDB` that never touches the network.
+
+  All instances share one in-memory database, the same way every real
+  `MongoDB()` points at the same server.
+  """
+
+  database = FakeDatabase("gamesanalyst")
+
+  def __init__(self, collection_name=None):
+    self.client = None
+    self.db = self.database
+
+    if collection_name:
+      self.collection = self.db[collection_name]
+
+  def get_db(self):
+    return self.db
+
+  @classmethod
+  def reset(cls) -> None:
+    cls.database = FakeDatabase("gamesanalyst")
+
+
+def patch_mongodb() -> ExitStack:
+  """Swap `MongoDB` for `FakeMongoDB` everywhere it is imported."""
+  stack = ExitStack()
+  for target in PATCH_TARGETS:
+    stack.enter_context(mock.patch(target, FakeMongoDB))
+  return stack
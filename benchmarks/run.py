@@ -0,0 +1,430 @@
+# run.py
+"""Offline benchmark runner.
+
+Measures wall time and peak traced memory for the scraper parse/write paths
+and the export endpoints against recorded HTML served from localhost and an
+in-memory Mongo stand-in, at several multiples of a base history size.
+
+Usage:
+  python -m benchmarks.run --output bench.json
+  python -m benchmarks.run --scales 1,10 --cases gematsu --compare bench.json
+"""
+import argparse
+import contextlib
+import gc
+import importlib
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from bs4 import BeautifulSoup
+
+from benchmarks.fake_mongo import FakeMongoDB, patch_mongodb
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import gematsu_weeks, metacritic_games
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Imported lazily by the app; loaded before timing so no case pays for them.
+# Import cost is what benchmarks.startup measures.
+WARM_IMPORTS = ("pandas", "openpyxl", "pytz")
+
+# Detail pages fetched per unit of scale by the get_existing_entries case.
+DETAIL_CALLS_PER_SCALE = 5
+# Recorded browse pages parsed per unit of scale by the extract_game_data case.
+BROWSE_PAGES_PER_SCALE = 5
+# Concurrent workers sharing the queue in the scrape_coordinated case.
+COORDINATED_WORKERS = 4
+
+
+@dataclass
+class Workload:
+  scale: int
+  base_weeks: int
+  base_games: int
+  stub: StubServer
+
+  @property
+  def weeks(self) -> int:
+    return self.base_weeks * self.scale
+
+  @property
+  def games(self) -> int:
+    return self.base_games * self.scale
+
+
+# name -> setup(workload) returning (operation, items processed by operation)
+CASES: dict[str, Callable[[Workload], tuple[Callable[[], object], int]]] = {}
+
+
+def case(name: str):
+  def register(setup):
+    CASES[name] = setup
+    return setup
+
+  return register
+
+
+def _gematsu_scraper(workload: Workload):
+  from src.gematsu_scraper import GematsuScraper
+
+  scraper = GematsuScraper()
+  scraper.base_url = workload.stub.gematsu_base_url
+  return scraper
+
+
+def _metacritic_scraper(workload: Workload):
+  from src.metacritic_scraper import MetacriticScraper
+
+  scraper = MetacriticScraper()
+  scraper.base_url = workload.stub.metacritic_base_url
+  return scraper
+
+
+def _listing_soup(scraper) -> BeautifulSoup:
+  response = scraper.session.get(scraper.base_url)
+  return BeautifulSoup(response.text, "html.parser")
+
+
+def _seed_history(workload: Workload) -> None:
+  FakeMongoDB.reset()
+  FakeMongoDB("gematsu_data").collection.insert_many(gematsu_weeks(workload.weeks))
+  FakeMongoDB("metacritic_scores").collection.insert_many(
+    metacritic_games(workload.games)
+  )
+
+
+def _scraped_weeks(workload: Workload) -> tuple[list[dict], list[dict]]:
+  games_sales_data, hardware_sales_data = [], []
+  for week in gematsu_weeks(workload.weeks):
+    key = {k: week[k] for k in ("link", "start_date", "end_date")}
+    games_sales_data.append({**key, "sales_data": week["sales_data"]})
+    hardware_sales_data.append(
+      {**key, "hardware_sales_data": week["hardware_sales_data"]}
+    )
+  return games_sales_data, hardware_sales_data
+
+
+@case("gematsu.parse_page")
+def parse_page(workload: Workload):
+  # Older history that never matches the listing, so find_one scans all of it.
+  FakeMongoDB.reset()
+  FakeMongoDB("gematsu_data").collection.insert_many(
+    gematsu_weeks(workload.weeks, end=datetime(2020, 1, 5))
+  )
+
+  # A previous run already stored every other week on the listing page.
+  previous = _gematsu_scraper(workload)
+  soup = _listing_soup(previous)
+  previous.parse_page(soup)
+  previous.write_to_mongodb()
+  links = [week["link"] for week in previous.games_sales_data]
+  previous.collection.delete_many({"link": {"$in": links[::2]}})
+
+  scraper = _gematsu_scraper(workload)
+  articles = soup.select(".gematsu-listing--famitsu-sales article.gematsu-post")
+  return (lambda: scraper.parse_page(soup)), len(articles)
+
+
+@case("gematsu.scrape_coordinated")
+def scrape_coordinated(workload: Workload):
+  from src.coordination import WorkQueue
+
+  # Backfill of every listing page by several workers against a stored history.
+  FakeMongoDB.reset()
+  FakeMongoDB("gematsu_data").collection.insert_many(
+    gematsu_weeks(workload.weeks, end=datetime(2020, 1, 5))
+  )
+  queue_collection = FakeMongoDB("scrape_queue").collection
+  scrapers = [_gematsu_scraper(workload) for _ in range(COORDINATED_WORKERS)]
+  weeks = len(scrapers[0].parse_listing(_listing_soup(scrapers[0])))
+
+  def run():
+    with ThreadPoolExecutor(COORDINATED_WORKERS) as pool:
+      list(
+        pool.map(
+          lambda scraper: scraper.scrape_coordinated(
+            WorkQueue(queue_collection), run_all_pages=True
+          ),
+          scrapers,
+        )
+      )
+
+  return run, weeks
+
+
+@case("gematsu.get_existing_entries")
+def get_existing_entries(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _gematsu_scraper(workload)
+  soup = _listing_soup(scraper)
+  links = [h2.a["href"] for h2 in soup.select("article.gematsu-post h2")]
+  calls = DETAIL_CALLS_PER_SCALE * workload.scale
+
+  def run():
+    for index in range(calls):
+      scraper.get_existing_entries(links[index % len(links)], None, None)
+
+  return run, calls
+
+
+@case("metacritic.extract_game_data")
+def extract_game_data(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _metacritic_scraper(workload)
+  response = scraper.session.get(scraper.base_url + "1")
+  soup = BeautifulSoup(response.content, "html.parser")
+  game_items = soup.find_all(
+    "div", class_="c-finderProductCard c-finderProductCard-game"
+  )
+  pages = BROWSE_PAGES_PER_SCALE * workload.scale
+
+  def run():
+    for page in range(1, pages + 1):
+      for game_item in game_items:
+        scraper.extract_game_data(game_item, page)
+
+  return run, pages * len(game_items)
+
+
+@case("gematsu.write_to_mongodb")
+def gematsu_write_to_mongodb(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _gematsu_scraper(workload)
+  scraper.games_sales_data, scraper.hardware_sales_data = _scraped_weeks(workload)
+  return scraper.write_to_mongodb, workload.weeks
+
+
+@case("gematsu.write_to_excel")
+def gematsu_write_to_excel(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _gematsu_scraper(workload)
+  scraper.games_sales_data, scraper.hardware_sales_data = _scraped_weeks(workload)
+  return scraper.write_to_excel, workload.weeks
+
+
+@case("gematsu.write_to_csv")
+def gematsu_write_to_csv(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _gematsu_scraper(workload)
+  scraper.games_sales_data, scraper.hardware_sales_data = _scraped_weeks(workload)
+  return scraper.write_to_csv, workload.weeks
+
+
+@case("metacritic.write_to_mongodb")
+def metacritic_write_to_mongodb(workload: Workload):
+  # Re-scrapes mostly update games that are already stored.
+  FakeMongoDB.reset()
+  games = metacritic_games(workload.games)
+  FakeMongoDB("metacritic_scores").collection.insert_many(
+    [dict(game) for game in games[: len(games) * 3 // 4]]
+  )
+  scraper = _metacritic_scraper(workload)
+  scraper.games_data = games
+  return scraper.write_to_mongodb, workload.games
+
+
+@case("metacritic.write_to_csv")
+def metacritic_write_to_csv(workload: Workload):
+  FakeMongoDB.reset()
+  scraper = _metacritic_scraper(workload)
+  scraper.games_data = metacritic_games(workload.games)
+  return scraper.write_to_csv, workload.games
+
+
+@case("export.metacritic_data")
+def export_metacritic_data(workload: Workload):
+  import main
+
+  _seed_history(workload)
+  return main.get_data, workload.games
+
+
+@case("export.gematsu_data")
+def export_gematsu_data(workload: Workload):
+  import main
+
+  _seed_history(workload)
+  return main.get_gematsu_data, workload.weeks
+
+
+@case("export.latest_data")
+def export_latest_data(workload: Workload):
+  import main
+
+  _seed_history(workload)
+  return main.get_combined_data, workload.weeks + workload.games
+
+
+def measure(setup, workload: Workload, repeat: int) -> dict:
+  timings = []
+  for _ in range(repeat):
+    operation, items = setup(workload)
+    gc.collect()
+    start = time.perf_counter()
+    operation()
+    timings.append(time.perf_counter() - start)
+
+  # Tracing slows execution down, so memory gets its own untimed pass.
+  operation, items = setup(workload)
+  gc.collect()
+  tracemalloc.start()
+  try:
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+  finally:
+    tracemalloc.stop()
+
+  seconds = statistics.median(timings)
+  return {
+    "items": items,
+    "repeat": repeat,
+    "seconds": seconds,
+    "seconds_min": min(timings),
+    "items_per_second": items / seconds if seconds else None,
+    "peak_memory_bytes": peak,
+  }
+
+
+def _git_revision() -> str | None:
+  try:
+    return subprocess.run(
+      ["git", "rev-parse", "HEAD"],
+      capture_output=True,
+      text=True,
+      check=True,
+      cwd=ROOT,
+    ).stdout.strip()
+  except (OSError, subprocess.CalledProcessError):
+    return None
+
+
+def run(
+  names: list[str], scales: list[int], repeat: int, base_weeks: int, base_games: int
+) -> dict:
+  results = []
+  workdir = os.getcwd()
+  # Keep the app importable once the working directory moves to the tmpdir.
+  if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+  for module in WARM_IMPORTS:
+    importlib.import_module(module)
+  with (
+    tempfile.TemporaryDirectory() as tmpdir,
+    patch_mongodb(),
+    StubServer(metacritic_pages=1) as stub,
+    open(os.devnull, "w") as devnull,
+  ):
+    # The write paths and exports drop files into the working directory.
+    os.chdir(tmpdir)
+    logging.disable(logging.INFO)
+    try:
+      for name in names:
+        for scale in scales:
+          workload = Workload(scale, base_weeks, base_games, stub)
+          with contextlib.redirect_stdout(devnull):
+            result = measure(CASES[name], workload, repeat)
+          results.append({"case": name, "scale": scale, **result})
+          print(
+            f"{name:<32} {scale:>4}x {result['items']:>7} items "
+            f"{result['seconds'] * 1000:>10.1f} ms "
+            f"{result['peak_memory_bytes'] / 2**20:>8.1f} MiB",
+            file=sys.stderr,
+          )
+    finally:
+      logging.disable(logging.NOTSET)
+      os.chdir(workdir)
+
+  return {
+    "meta": report_meta(base_weeks=base_weeks, base_games=base_games),
+    "results": results,
+  }
+
+
+def report_meta(**extra) -> dict:
+  return {
+    "created_at": datetime.now().isoformat(timespec="seconds"),
+    "git_revision": _git_revision(),
+    "python": platform.python_version(),
+    "platform": platform.platform(),
+    **extra,
+  }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+  """Return a line per (case, scale) whose time or memory grew past `threshold`."""
+  previous = {(r["case"], r["scale"]): r for r in baseline["results"]}
+  regressions = []
+  for result in current["results"]:
+    before = previous.get((result["case"], result["scale"]))
+    if before is None:
+      continue
+    for metric in ("seconds", "peak_memory_bytes"):
+      if not before[metric]:
+        continue
+      ratio = result[metric] / before[metric]
+      print(
+        f"{result['case']:<32} {result['scale']:>4}x {metric:<18} {ratio:>6.2f}x",
+        file=sys.stderr,
+      )
+      if ratio > threshold:
+        regressions.append(
+          f"{result['case']} @ {result['scale']}x: {metric} {ratio:.2f}x baseline"
+        )
+  return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--scales", default="1,10,100", help="comma separated history multiples")
+  parser.add_argument("--repeat", type=int, default=3, help="timed runs per case and scale")
+  parser.add_argument("--cases", default="", help="only run cases whose name contains this")
+  parser.add_argument("--base-weeks", type=int, default=20, help="Gematsu weeks at 1x")
+  parser.add_argument("--base-games", type=int, default=50, help="Metacritic games at 1x")
+  parser.add_argument("--output", help="write the JSON results here instead of stdout")
+  parser.add_argument("--compare", help="baseline JSON results to compare against")
+  parser.add_argument(
+    "--threshold", type=float, default=1.25, help="ratio over baseline that fails --compare"
+  )
+  args = parser.parse_args(argv)
+
+  names = [name for name in CASES if args.cases in name]
+  scales = [int(scale) for scale in args.scales.split(",")]
+  report = run(names, scales, args.repeat, args.base_weeks, args.base_games)
+
+  return write_report(report, args.output, args.compare, args.threshold)
+
+
+def write_report(
+  report: dict, output: str | None, baseline: str | None, threshold: float
+) -> int:
+  """Write `report` as JSON and return the exit code for any regressions."""
+  if output:
+    with open(output, "w") as f:
+      json.dump(report, f, indent=2)
+  else:
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+
+  if baseline:
+    with open(baseline) as f:
+      regressions = compare(report, json.load(f), threshold)
+    for regression in regressions:
+      print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,109 @@
+# startup.py
+"""Application startup benchmark.
+
+Imports the FastAPI app in fresh interpreters, the way a container cold start
+or a `uvicorn --reload` restart does, and records the import time, the peak
+RSS of the process and which heavy dependencies the import pulled in.
+
+Usage:
+  python -m benchmarks.startup --output startup.json
+  python -m benchmarks.startup --compare startup.json
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+from benchmarks.run import ROOT, report_meta, write_report
+
+# Dependencies that should only be imported by the endpoints that need them.
+HEAVY_MODULES = ("pandas", "pytz", "bs4", "requests", "pymongo")
+
+# Runs in the child interpreter; prints one JSON line on the last line of stdout.
+PROBE = """
+import json, resource, sys, time
+
+start = time.perf_counter()
+import main
+seconds = time.perf_counter() - start
+
+if {construct}:
+  from src.scrapers import get_scraper_class
+
+  start = time.perf_counter()
+  for name in ("gematsu", "metacritic"):
+    get_scraper_class(name)()
+  seconds = time.perf_counter() - start
+
+print(json.dumps({{
+  "seconds": seconds,
+  "peak_memory_bytes": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+  "loaded_modules": sorted(name for name in {heavy!r} if name in sys.modules),
+}}))
+"""
+
+# name -> whether the probe also constructs every registered scraper
+CASES = {
+  "startup.import_main": False,
+  "startup.construct_scrapers": True,
+}
+
+
+def probe(construct: bool) -> dict:
+  completed = subprocess.run(
+    [sys.executable, "-c", PROBE.format(construct=construct, heavy=HEAVY_MODULES)],
+    capture_output=True,
+    text=True,
+    check=True,
+    cwd=ROOT,
+  )
+  return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run(names: list[str], repeat: int) -> dict:
+  results = []
+  for name in names:
+    samples = [probe(CASES[name]) for _ in range(repeat)]
+    timings = [sample["seconds"] for sample in samples]
+    seconds = statistics.median(timings)
+    result = {
+      "case": name,
+      "scale": 1,
+      "items": 1,
+      "repeat": repeat,
+      "seconds": seconds,
+      "seconds_min": min(timings),
+      "items_per_second": 1 / seconds if seconds else None,
+      "peak_memory_bytes": max(sample["peak_memory_bytes"] for sample in samples),
+      "loaded_modules": samples[-1]["loaded_modules"],
+    }
+    results.append(result)
+    print(
+      f"{name:<32} {seconds * 1000:>10.1f} ms "
+      f"{result['peak_memory_bytes'] / 2**20:>8.1f} MiB "
+      f"loaded: {', '.join(result['loaded_modules']) or '-'}",
+      file=sys.stderr,
+    )
+  return {"meta": report_meta(), "results": results}
+
+
+def main(argv: list[str] | None = None) -> int:
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per case")
+  parser.add_argument("--cases", default="", help="only run cases whose name contains this")
+  parser.add_argument("--output", help="write the JSON results here instead of stdout")
+  parser.add_argument("--compare", help="baseline JSON results to compare against")
+  parser.add_argument(
+    "--threshold", type=float, default=1.25, help="ratio over baseline that fails --compare"
+  )
+  args = parser.parse_args(argv)
+
+  names = [name for name in CASES if args.cases in name]
+  report = run(names, args.repeat)
+
+  return write_report(report, args.output, args.compare, args.threshold)
+
+
+if __name__ == "__main__":
+  sys.exit(main())
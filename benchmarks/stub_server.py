@@ -0,0 +1,89 @@
+# stub_server.py
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Hosts in the recorded pages, rewritten to point back at the stub when served.
+RECORDED_HOSTS = ("https://www.gematsu.com", "https://www.metacritic.com")
+
+
+def load_fixture(name: str) -> str:
+  return (FIXTURES_DIR / name).read_text(encoding="utf-8")
+
+
+class _Handler(BaseHTTPRequestHandler):
+  server: "_StubHTTPServer"
+
+  def do_GET(self):
+    url = urllib.parse.urlsplit(self.path)
+    if url.path.startswith("/tag/famitsu-sales"):
+      body = self.server.pages["gematsu_listing.html"]
+    elif url.path.startswith("/browse/game"):
+      page = int(urllib.parse.parse_qs(url.query).get("page", ["1"])[0] or 1)
+      if page > self.server.metacritic_pages:
+        body = self.server.pages["metacritic_empty"]
+      else:
+        body = self.server.pages["metacritic_browse.html"]
+    else:
+      body = self.server.pages["gematsu_detail.html"]
+
+    payload = body.encode("utf-8")
+    self.send_response(200)
+    self.send_header("Content-Type", "text/html; charset=UTF-8")
+    self.send_header("Content-Length", str(len(payload)))
+    self.end_headers()
+    self.wfile.write(payload)
+
+  def log_message(self, format, *args):
+    pass
+
+
+class _StubHTTPServer(ThreadingHTTPServer):
+  daemon_threads = True
+  pages: dict[str, str]
+  metacritic_pages: int
+
+
+class StubServer:
+  """Serves the recorded Gematsu and Metacritic pages on localhost.
+
+  Gematsu listing requests (`/tag/famitsu-sales[/page/N]`) get the recorded
+  listing, Metacritic browse requests get the recorded browse page until
+  `metacritic_pages` is exceeded, and every other path gets the recorded
+  Gematsu detail page.
+  """
+
+  def __init__(self, metacritic_pages: int = 1):
+    self._server = _StubHTTPServer(("127.0.0.1", 0), _Handler)
+    self._server.metacritic_pages = metacritic_pages
+    self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    host, port = self._server.server_address[:2]
+    self.url = f"http://{host}:{port}"
+
+    self._server.pages = {}
+    for name in ("gematsu_listing.html", "gematsu_detail.html", "metacritic_browse.html"):
+      html = load_fixture(name)
+      for recorded_host in RECORDED_HOSTS:
+        html = html.replace(recorded_host, self.url)
+      self._server.pages[name] = html
+    self._server.pages["metacritic_empty"] = "<html><body></body></html>"
+
+  @property
+  def gematsu_base_url(self) -> str:
+    return f"{self.url}/tag/famitsu-sales"
+
+  @property
+  def metacritic_base_url(self) -> str:
+    return f"{self.url}/browse/game/?page="
+
+  def __enter__(self) -> "StubServer":
+    self._thread.start()
+    return self
+
+  def __exit__(self, *exc_info) -> None:
+    self._server.shutdown()
+    self._server.server_close()
@@ -0,0 +1,107 @@
+# synthetic.py
+import random
+from datetime import datetime, timedelta
+
+from bs4 import BeautifulSoup
+
+from benchmarks.stub_server import load_fixture
+
+
+def _recorded_rows() -> tuple[list[dict], list[dict], list[dict]]:
+  """Pull the title/platform pools out of the recorded fixtures."""
+  detail = BeautifulSoup(load_fixture("gematsu_detail.html"), "html.parser")
+  software_ol, hardware_ol = [
+    ol
+    for ol in detail.select(".post__content-main ol")
+    if "display: none" not in ol.get("style", "")
+  ]
+  software = [
+    {
+      "platform": li.text.split(" ")[0].strip("[]"),
+      "game_title": li.em.text,
+      "company": li.text.split("(", 1)[1].split(",", 1)[0],
+    }
+    for li in software_ol.find_all("li")
+  ]
+  hardware = [{"platform": li.text.split("–")[0].strip()} for li in hardware_ol.find_all("li")]
+
+  browse = BeautifulSoup(load_fixture("metacritic_browse.html"), "html.parser")
+  games = [
+    {"title": h3.text.strip().split(". ", 1)[1]}
+    for h3 in browse.find_all("h3", class_="c-finderProductCard_titleHeading")
+  ]
+  return software, hardware, games
+
+
+SOFTWARE_ROWS, HARDWARE_ROWS, METACRITIC_GAMES = _recorded_rows()
+
+
+def gematsu_weeks(weeks: int, end: datetime | None = None, seed: int = 0) -> list[dict]:
+  """Generate `weeks` weekly Gematsu documents shaped like `write_to_mongodb` output.
+
+  The most recent week ends on `end` (default: today) so that date-windowed
+  exports see a realistic slice of the history.
+  """
+  rng = random.Random(seed)
+  end = (end or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+  documents = []
+  for week in range(weeks):
+    end_date = end - timedelta(weeks=week)
+    start_date = end_date - timedelta(days=6)
+    link = f"https://www.gematsu.com/{end_date:%Y/%m}/famitsu-sales-{start_date:%m-%d-%y}-{end_date:%m-%d-%y}"
+    sales_data = []
+    for row in SOFTWARE_ROWS:
+      weekly_sales = rng.randint(1_000, 150_000)
+      sales_data.append(
+        {
+          **row,
+          "release_date": end_date - timedelta(days=rng.randint(0, 2_000)),
+          "weekly_sales": weekly_sales,
+          "total_sales": weekly_sales * rng.randint(1, 40),
+        }
+      )
+    hardware_sales_data = []
+    for row in HARDWARE_ROWS:
+      weekly_sales = rng.randint(100, 50_000)
+      hardware_sales_data.append(
+        {
+          **row,
+          "weekly_sales": weekly_sales,
+          "lifetime_sales": weekly_sales * rng.randint(50, 500),
+        }
+      )
+    documents.append(
+      {
+        "link": link,
+        "start_date": start_date,
+        "end_date": end_date,
+        "sales_data": sales_data,
+        "hardware_sales_data": hardware_sales_data,
+        "update_timestamp": end_date + timedelta(days=3),
+      }
+    )
+  return documents
+
+
+def metacritic_games(count: int, seed: int = 0) -> list[dict]:
+  """Generate `count` Metacritic documents shaped like `extract_game_data` output.
+
+  Titles cycle through the recorded browse page, with a numeric suffix once
+  the pool is exhausted so every document stays unique.
+  """
+  rng = random.Random(seed)
+  games = []
+  for index in range(count):
+    base = METACRITIC_GAMES[index % len(METACRITIC_GAMES)]["title"]
+    cycle = index // len(METACRITIC_GAMES)
+    games.append(
+      {
+        "title": base if cycle == 0 else f"{base} ({cycle})",
+        "release_date": (datetime(2023, 1, 1) + timedelta(days=rng.randint(0, 500))).strftime(
+          "%Y-%m-%d"
+        ),
+        "rating": rng.choice(["E", "E10+", "T", "M", "N/A"]),
+        "metascore": str(rng.randint(40, 97)),
+      }
+    )
+  return games
@@ -1,19 +1,14 @@
 import logging
-import os
-import pandas as pd
 from fastapi import FastAPI
 from fastapi.responses import FileResponse
-from pandas import json_normalize
 
-import pandas as pd
 from datetime import datetime, timedelta
-from pymongo import MongoClient
+from src.coordination import WorkQueue
 from src.db import MongoDB
+from src.scrapers import get_scraper_class
 
-
-from src.gematsu_scraper import GematsuScraper
-from src.metacritic_scraper import MetacriticScraper
-from pytz import timezone
+# pandas, pytz and the scraper modules (BeautifulSoup, requests) are imported
+# inside the endpoints that need them so that importing the app stays cheap.
 
 
 # Create a custom logger
@@ -46,7 +41,7 @@ def scrape_metacritic():
   writes the scraped data to a CSV file, and then writes the data to the MongoDB database.
   """
   logger.info("Scraping started.")
-  scraper = MetacriticScraper()
+  scraper = get_scraper_class("metacritic")()
   scraper.scrape()
   scraper.write_to_csv()
   scraper.write_to_mongodb()
@@ -55,18 +50,34 @@ def scrape_metacritic():
 
 
 @app.get("/api/v1/scrape-gematsu", tags=["Scraping"])
-def scrape_gematsu():
+def scrape_gematsu(run_all_pages: bool = False):
   """
   This endpoint initiates the scraping process for Gematsu data. 
-  It creates a new instance of the GematsuScraper, calls the scrape method to scrape data, 
-  and then writes the scraped data to the MongoDB database.
+  Listing pages and weekly detail pages are claimed from a shared work queue in MongoDB, 
+  so several workers or replicas calling it at once split the work and write each week only once. 
+  The landing page is always re-checked. Set run_all_pages to backfill every listing page instead of just the first one. 
+  Pages that kept failing are listed in failed_items and are retried by a later call after a cooldown.
   """
   logger.info("Gematsu scraping started.")
-  scraper = GematsuScraper()
-  scraper.scrape()
-  scraper.write_to_mongodb()
-  logger.info("Gematsu scraping completed and data written to MongoDB.")
-  return {"message": "Gematsu scraping completed and data written to MongoDB."}
+  scraper = get_scraper_class("gematsu")()
+  try:
+    scraper.ensure_indexes()
+  except RuntimeError as e:
+    logger.error(e)
+    raise
+
+  queue = WorkQueue(MongoDB(collection_name="scrape_queue").collection)
+  weeks_written = scraper.scrape_coordinated(queue, run_all_pages=run_all_pages)
+
+  failed_items = queue.dead_items()
+  if failed_items:
+    logger.error(f"Gematsu pages that kept failing: {failed_items}")
+  logger.info(f"Gematsu scraping completed, {weeks_written} weeks written to MongoDB.")
+  return {
+    "message": "Gematsu scraping completed and data written to MongoDB.",
+    "weeks_written": weeks_written,
+    "failed_items": failed_items,
+  }
 
 
 @app.get(
@@ -78,8 +89,10 @@ def get_data():
   converts the data to a pandas DataFrame, and then writes the DataFrame to a CSV file. 
   The CSV file is then returned as a response.
   """
+  import pandas as pd
+
   logger.info("Data retrieval started.")
-  scraper = MetacriticScraper()
+  scraper = get_scraper_class("metacritic")()
 
   try:
     # check if the 'metacritic_scores' collection exists
@@ -112,8 +125,10 @@ def get_gematsu_data():
   and then writes the DataFrames to an Excel file with two tabs. 
   The Excel file is then returned as a response.
   """
+  import pandas as pd
+
   logger.info("Gematsu data retrieval started.")
-  scraper = GematsuScraper()
+  scraper = get_scraper_class("gematsu")()
 
   # try:
   #   # check if there is any gematsu_data in the gamesanalyst database. If not, return 404 no data found
@@ -129,8 +144,8 @@ def get_gematsu_data():
   data = list(scraper.collection.find())
 
   # Flatten the sales data and hardware sales data
-  sales_data = json_normalize(data, "sales_data", ["link", "start_date", "end_date"])
-  hardware_sales_data = json_normalize(
+  sales_data = pd.json_normalize(data, "sales_data", ["link", "start_date", "end_date"])
+  hardware_sales_data = pd.json_normalize(
     data, "hardware_sales_data", ["link", "start_date", "end_date"]
   )
 
@@ -159,6 +174,9 @@ def get_combined_data():
   It then flattens the 'sales_data' list of dictionaries in the 'gematsu_data' and converts it to a pandas DataFrame.
   And then it merges the two DataFrames on the game name so that the metacritic data is added to the gematsu data.
   """
+  import pandas as pd
+  from pytz import timezone
+
   mongo = MongoDB()
   db = mongo.get_db()
 
@@ -172,7 +190,7 @@ def get_combined_data():
   metacritic_data = list(db["metacritic_scores"].find())
 
   # the gematsu_data contains a list of dictionaries in the 'sales_data', so we need to flatten it
-  gematsu_sales_data = json_normalize(gematsu_data, "sales_data", ["link", "start_date", "end_date"])
+  gematsu_sales_data = pd.json_normalize(gematsu_data, "sales_data", ["link", "start_date", "end_date"])
 
   # convert gematsu_sales_data to a pandas DataFrame
   # Convert the queried data to pandas DataFrames
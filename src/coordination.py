@@ -0,0 +1,184 @@
+# coordination.py
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+import logging
+import os
+import socket
+import uuid
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id() -> str:
+  return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class WorkQueue:
+  """Mongo-backed work queue that lets several workers share a scrape.
+
+  Each work item is a document keyed by `<kind>:<key>`. A worker claims an
+  item by atomically flipping it to `leased` with an expiry; if the worker
+  dies, the lease runs out and the item becomes claimable again, but only to
+  a worker that calls `claim` after that; nobody waits for it. Items that
+  keep failing, or whose workers keep dying, stop being claimed after
+  `max_attempts` claims until `enqueue` is called for them again at least
+  `retry_seconds` later, which resets their attempts.
+  """
+
+  def __init__(
+    self,
+    collection,
+    worker_id: str | None = None,
+    lease_seconds: float = 300,
+    max_attempts: int = 5,
+    retry_seconds: float = 300,
+  ):
+    self.collection = collection
+    self.worker_id = worker_id or default_worker_id()
+    self.lease = timedelta(seconds=lease_seconds)
+    self.max_attempts = max_attempts
+    self.retry_after = timedelta(seconds=retry_seconds)
+
+  def ensure_indexes(self):
+    self.collection.create_index([("kind", 1), ("status", 1), ("lease_expires_at", 1)])
+
+  def enqueue(self, kind: str, key: str, payload: dict, reopen_after: timedelta | None = None):
+    """Add an item unless it already exists.
+
+    An existing item that gave up after `max_attempts` goes back to `pending`
+    once `retry_after` has passed. With `reopen_after`, an item that was
+    finished longer ago than that goes back to `pending` too, so pages that
+    change over time get re-scraped. Reopened items go to the back of the
+    queue.
+    """
+    now = datetime.now(timezone.utc)
+    item_id = f"{kind}:{key}"
+    reopen = [
+      {"status": FAILED, "failed_at": {"$lt": now - self.retry_after}},
+      {
+        "status": LEASED,
+        "attempts": {"$gte": self.max_attempts},
+        "lease_expires_at": {"$lt": now - self.retry_after},
+      },
+    ]
+    if reopen_after is not None:
+      reopen.append({"status": DONE, "completed_at": {"$lt": now - reopen_after}})
+    self.collection.update_one(
+      {"_id": item_id, "$or": reopen},
+      {
+        "$set": {
+          "status": PENDING,
+          "payload": payload,
+          "attempts": 0,
+          "lease_expires_at": None,
+          "enqueued_at": now,
+        }
+      },
+    )
+    self.collection.update_one(
+      {"_id": item_id},
+      {
+        "$setOnInsert": {
+          "kind": kind,
+          "payload": payload,
+          "status": PENDING,
+          "attempts": 0,
+          "enqueued_at": now,
+        }
+      },
+      upsert=True,
+    )
+
+  def claim(self, kind: str):
+    """Lease the oldest claimable item of `kind`, or return None if there is none."""
+    from pymongo import ReturnDocument
+
+    now = datetime.now(timezone.utc)
+    return self.collection.find_one_and_update(
+      {
+        "kind": kind,
+        "attempts": {"$lt": self.max_attempts},
+        "$or": [
+          {"status": PENDING},
+          {"status": LEASED, "lease_expires_at": {"$lt": now}},
+        ],
+      },
+      {
+        "$set": {
+          "status": LEASED,
+          "lease_owner": self.worker_id,
+          "lease_expires_at": now + self.lease,
+        },
+        "$inc": {"attempts": 1},
+      },
+      sort=[("enqueued_at", 1)],
+      return_document=ReturnDocument.AFTER,
+    )
+
+  def complete(self, item: dict) -> bool:
+    """Mark a leased item done. Returns False if the lease was lost meanwhile."""
+    result = self.collection.update_one(
+      {"_id": item["_id"], "lease_owner": self.worker_id, "status": LEASED},
+      {"$set": {"status": DONE, "completed_at": datetime.now(timezone.utc)}},
+    )
+    return result.modified_count == 1
+
+  def release(self, item: dict):
+    """Give a leased item back after a failure so it can be retried.
+
+    The item goes to the back of the queue, so other items are tried first.
+    """
+    now = datetime.now(timezone.utc)
+    status = FAILED if item.get("attempts", 0) >= self.max_attempts else PENDING
+    self.collection.update_one(
+      {"_id": item["_id"], "lease_owner": self.worker_id, "status": LEASED},
+      {
+        "$set": {
+          "status": status,
+          "lease_expires_at": None,
+          "failed_at": now,
+          "enqueued_at": now,
+        }
+      },
+    )
+
+  def dead_items(self, kind: str | None = None) -> list[str]:
+    """Return the ids of items no worker will claim until they are enqueued again."""
+    query = {
+      "$or": [
+        {"status": FAILED},
+        {
+          "status": LEASED,
+          "attempts": {"$gte": self.max_attempts},
+          "lease_expires_at": {"$lt": datetime.now(timezone.utc)},
+        },
+      ]
+    }
+    if kind is not None:
+      query["kind"] = kind
+    return [item["_id"] for item in self.collection.find(query, {"_id": 1})]
+
+  @contextmanager
+  def leased(self, item: dict):
+    """Complete `item` when the block finishes, or release it if the block raises.
+
+    An `Exception` from the block is logged and suppressed so the caller can
+    move on to the next item; anything else (e.g. KeyboardInterrupt) is
+    re-raised after the release.
+    """
+    try:
+      yield item
+    except Exception:
+      logger.exception(f"Work item {item['_id']} failed, released for retry.")
+      self.release(item)
+      return
+    except BaseException:
+      self.release(item)
+      raise
+    if not self.complete(item):
+      logger.warning(f"Lease on {item['_id']} was lost before it could be completed.")
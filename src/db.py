@@ -1,20 +1,33 @@
 # db.py
-from pymongo import MongoClient
+from functools import cache
 import urllib.parse
 from dotenv import load_dotenv
 import os
 
-load_dotenv()  # take environment variables from .env.
+
+@cache
+def load_env():
+  load_dotenv()  # take environment variables from .env.
+
+
+@cache
+def get_client(uri: str):
+  # pymongo is imported, and the client created, on first use rather than at
+  # import time. Every MongoDB() for the same URI shares one connection pool.
+  from pymongo import MongoClient
+
+  return MongoClient(uri)
 
 
 class MongoDB:
   def __init__(self, collection_name=None):
+    load_env()
     username = urllib.parse.quote_plus(os.getenv("MONGODB_DB_USERNAME"))
     password = urllib.parse.quote_plus(os.getenv("MONGODB_DB_PASSWORD"))
     host = os.getenv("MONGODB_DB_HOST")
     port = os.getenv("MONGODB_DB_PORT")
 
-    self.client = MongoClient(f"mongodb://{username}:{password}@{host}:{port}")
+    self.client = get_client(f"mongodb://{username}:{password}@{host}:{port}")
     self.db = self.client["gamesanalyst"]
 
     if collection_name:
@@ -0,0 +1,43 @@
+# dedupe_weeks.py
+"""One-off migration removing duplicate Gematsu weeks.
+
+Versions before the shared scrape queue could store the same week more than
+once, which stops the unique week index from being built. Run this once,
+before deploying, against a database written by those versions:
+
+  python -m src.dedupe_weeks
+"""
+from src.db import MongoDB
+from src.gematsu_scraper import WEEK_KEY
+
+
+def dedupe_gematsu_weeks(collection) -> int:
+  """Delete all but the oldest document of every duplicated week.
+
+  Returns:
+      the number of documents deleted
+  """
+  duplicates = collection.aggregate(
+    [
+      {"$sort": {"_id": 1}},
+      {
+        "$group": {
+          "_id": {field: f"${field}" for field in WEEK_KEY},
+          "ids": {"$push": "$_id"},
+          "count": {"$sum": 1},
+        }
+      },
+      {"$match": {"count": {"$gt": 1}}},
+    ],
+    allowDiskUse=True,
+  )
+  duplicate_ids = [doc_id for group in duplicates for doc_id in group["ids"][1:]]
+  if duplicate_ids:
+    collection.delete_many({"_id": {"$in": duplicate_ids}})
+  return len(duplicate_ids)
+
+
+if __name__ == "__main__":
+  collection = MongoDB(collection_name="gematsu_data").collection
+  removed = dedupe_gematsu_weeks(collection)
+  print(f"Removed {removed} duplicate weeks from gematsu_data.")
@@ -1,12 +1,23 @@
 # Import necessary libraries
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import cached_property
 from bs4 import BeautifulSoup
-import pandas as pd
+from pymongo.errors import DuplicateKeyError, OperationFailure
 import requests
 import re
 
 from src.db import MongoDB
 
+# Work item kinds in the shared scrape queue
+LISTING = "gematsu_listing"
+DETAIL = "gematsu_detail"
+
+# Fields that identify one week of sales
+WEEK_KEY = ("link", "start_date", "end_date")
+
+# Collections this process has already deduplicated and indexed
+_indexed_collections = set()
+
 
 class GematsuScraper:
   def __init__(self):
@@ -21,9 +32,19 @@ class GematsuScraper:
     self.games_sales_data = []
     self.hardware_sales_data = []
 
-    self.mongo = MongoDB(collection_name="gematsu_data")
-    self.db = self.mongo.db
-    self.collection = self.mongo.collection
+  # The MongoDB connection is only set up the first time it is used, so
+  # constructing a scraper does no I/O.
+  @cached_property
+  def mongo(self):
+    return MongoDB(collection_name="gematsu_data")
+
+  @cached_property
+  def db(self):
+    return self.mongo.db
+
+  @cached_property
+  def collection(self):
+    return self.mongo.collection
 
   def get_existing_entries(
     self, link: str, start_date: datetime, end_date: datetime
@@ -145,7 +166,10 @@ class GematsuScraper:
       )
     return sales_data_list, hardware_sales_data_list
 
-  def parse_page(self, soup):
+  def parse_listing(self, soup) -> list[dict]:
+    """Return the link, start date and end date of every week on a listing page."""
+    weeks = []
+
     # Find all the <article> tags with class 'gematsu-post'
     articles = soup.select(".gematsu-listing--famitsu-sales article.gematsu-post")
 
@@ -163,61 +187,146 @@ class GematsuScraper:
       start_date = datetime.strptime(start_date_str, "%m/%d/%y")
       end_date = datetime.strptime(end_date_str, "%m/%d/%y")
 
-      # If the title matches the pattern "Famitsu Sales: DD/MM/YY – DD/MM/YY" and is not already in the database, navigate to the detail page, otherwise skip
+      weeks.append({"link": link, "start_date": start_date, "end_date": end_date})
+    return weeks
 
-      if (
-        self.collection.find_one(
-          {"start_date": start_date, "end_date": end_date, "link": link}
-        )
-        is None
-      ):
+  def add_week(self, week: dict, sale_data_list: list, hardware_sales_data_list: list):
+    if sale_data_list:
+      self.games_sales_data.append({**week, "sales_data": sale_data_list})
+    if hardware_sales_data_list:
+      self.hardware_sales_data.append(
+        {**week, "hardware_sales_data": hardware_sales_data_list}
+      )
+
+  def parse_page(self, soup):
+    for week in self.parse_listing(soup):
+      # If the week is not already in the database, navigate to the detail page, otherwise skip
+      if self.collection.find_one(week) is None:
         sale_data_list, hardware_sales_data_list = self.get_existing_entries(
-          link, start_date, end_date
+          week["link"], week["start_date"], week["end_date"]
         )
-        if sale_data_list:
-          self.games_sales_data.append(
-            {
-              "link": link,
-              "start_date": start_date,
-              "end_date": end_date,
-              "sales_data": sale_data_list,
-            }
-          )
-        if hardware_sales_data_list:
-          self.hardware_sales_data.append(
-            {
-              "link": link,
-              "start_date": start_date,
-              "end_date": end_date,
-              "hardware_sales_data": hardware_sales_data_list,
-            }
-          )
+        self.add_week(week, sale_data_list, hardware_sales_data_list)
 
-  def scrape(self, run_all_pages=False):
-    # Get the HTML content of the landing page
-    response = self.session.get(self.base_url)
-    soup = BeautifulSoup(response.text, "html.parser")
+  def get_soup(self, url: str):
+    response = self.session.get(url)
+    return BeautifulSoup(response.text, "html.parser")
+
+  def page_url(self, page: int) -> str:
+    return self.base_url if page == 1 else f"{self.base_url}/page/{page}"
 
-    # Parse the top page
+  def last_page(self, soup) -> int:
+    # The last page-numbers link is "Next", the one before it is the last page
+    pagination = soup.find("div", class_="gematsu-pagination")
+    return int(pagination.find_all("a", class_="page-numbers")[-2].text)
+
+  def scrape(self, run_all_pages=False):
+    # Get the HTML content of the landing page and parse it
+    soup = self.get_soup(self.page_url(1))
     self.parse_page(soup)
 
     if run_all_pages:
-      # Find the last page number
-      pagination = soup.find("div", class_="gematsu-pagination")
-      last_page = int(pagination.find_all("a", class_="page-numbers")[-2].text)
-
       # Loop through all the pages
-      for page in range(2, last_page + 1):
-        page_url = f"{self.base_url}/page/{page}"
+      for page in range(2, self.last_page(soup) + 1):
+        self.parse_page(self.get_soup(self.page_url(page)))
 
-        # Get the HTML content of the page
-        response = self.session.get(page_url)
-        soup = BeautifulSoup(response.text, "html.parser")
+    return self.games_sales_data
 
-        # Parse the page
-        self.parse_page(soup)
+  def scrape_coordinated(
+    self, queue, run_all_pages=False, listing_refresh=timedelta(hours=1)
+  ) -> int:
+    """Scrape as one of several workers sharing `queue` (a `WorkQueue`).
 
-    return self.games_sales_data
+    Listing pages and weekly detail pages are claimed from the queue, so
+    concurrent workers split the work. Each week is written as soon as its
+    detail page is parsed, and only if no worker has stored it yet.
+
+    The landing page is scanned again on every call so new weeks are always
+    picked up. A page that raises is logged and released for a retry, and
+    the worker moves on to the next item. This worker returns once nothing is
+    left to claim, without
+    waiting on pages leased by other workers; a page whose worker crashed is
+    picked up by the first call made after its lease has expired.
+
+    Args:
+        queue (WorkQueue): queue shared by every worker
+        run_all_pages (bool): enqueue every listing page, not just the first
+        listing_refresh (timedelta): how long a scanned backfill page (page 2
+            onwards) stays done before a new call scans it again
+
+    Returns:
+        the number of weeks written by this worker
+    """
+    queue.ensure_indexes()
+    self.ensure_indexes()
+
+    last_page = self.last_page(self.get_soup(self.page_url(1))) if run_all_pages else 1
+    for page in range(1, last_page + 1):
+      url = self.page_url(page)
+      reopen_after = timedelta(0) if page == 1 else listing_refresh
+      queue.enqueue(LISTING, url, {"url": url}, reopen_after=reopen_after)
+
+    while (item := queue.claim(LISTING)) is not None:
+      with queue.leased(item):
+        for week in self.parse_listing(self.get_soup(item["payload"]["url"])):
+          if self.collection.find_one(week) is None:
+            # Reopen finished items too, in case the week was deleted since
+            queue.enqueue(DETAIL, week["link"], week, reopen_after=timedelta(0))
+
+    weeks_written = 0
+    update_timestamp = datetime.now()
+    while (item := queue.claim(DETAIL)) is not None:
+      with queue.leased(item):
+        week = {field: item["payload"][field] for field in WEEK_KEY}
+        sale_data_list, hardware_sales_data_list = self.get_existing_entries(
+          week["link"], week["start_date"], week["end_date"]
+        )
+        if sale_data_list and self.write_week(
+          {
+            **week,
+            "sales_data": sale_data_list,
+            "hardware_sales_data": hardware_sales_data_list or None,
+          },
+          update_timestamp,
+        ):
+          weeks_written += 1
+
+    return weeks_written
+
+  def ensure_indexes(self):
+    """Build the unique week index, once per collection per process.
+
+    Raises:
+        RuntimeError: if duplicate weeks stored by older versions prevent the
+            index; run `python -m src.dedupe_weeks` to remove them
+    """
+    if self.collection in _indexed_collections:
+      return
+    try:
+      self.collection.create_index([(field, 1) for field in WEEK_KEY], unique=True)
+    except OperationFailure as e:
+      raise RuntimeError(
+        "Could not create the unique week index on gematsu_data. "
+        "Remove duplicate weeks with `python -m src.dedupe_weeks` first."
+      ) from e
+    _indexed_collections.add(self.collection)
+
+  def write_week(self, week: dict, update_timestamp: datetime) -> bool:
+    """Insert one week's document unless that week is already stored.
+
+    Returns:
+        True if this call inserted the week
+    """
+    key = {field: week[field] for field in WEEK_KEY}
+    try:
+      result = self.collection.update_one(
+        key,
+        {"$setOnInsert": {**week, "update_timestamp": update_timestamp}},
+        upsert=True,
+      )
+    except DuplicateKeyError:
+      # Another worker inserted the same week between our lookup and insert
+      return False
+    return result.upserted_id is not None
 
   def write_to_mongodb(self):
     # Get the current date and time
@@ -241,19 +350,21 @@ class GematsuScraper:
         None,
       )
 
-      # Save the data to the MongoDB collection
-      self.collection.insert_one(
+      # Save the data to the MongoDB collection, skipping weeks already stored
+      self.write_week(
         {
           "link": link,
           "start_date": start_date,
           "end_date": end_date,
           "sales_data": sales_data_list,
           "hardware_sales_data": hardware_sales_data_list,
-          "update_timestamp": update_timestamp,
-        }
+        },
+        update_timestamp,
       )
 
   def write_to_excel(self):
+    import pandas as pd
+
     # Create a Pandas DataFrame from the games_data list
     flat_data = [
       {
@@ -297,6 +408,8 @@ class GematsuScraper:
       print("No data to write.")
 
   def write_to_csv(self):
+    import pandas as pd
+
     # Create a Pandas DataFrame from the games_data list
     # first flatten the list of dictionaries so that each dictionary is a row in the dataframe and each software sale is a row with the same link, start_date, and end_date
     flat_data = [
@@ -2,6 +2,7 @@ import time
 import requests
 from bs4 import BeautifulSoup
 from datetime import datetime
+from functools import cached_property
 import csv
 
 from src.db import MongoDB
@@ -23,9 +24,14 @@ class MetacriticScraper:
     )
     self.games_data = []
 
-    self.db = MongoDB(collection_name='metacritic_scores')
-    self.collection = self.db.collection
+  # Connect on first access instead of in __init__.
+  @cached_property
+  def db(self):
+    return MongoDB(collection_name='metacritic_scores')
 
+  @cached_property
+  def collection(self):
+    return self.db.collection
 
   def scrape(self):
     page:int = 1
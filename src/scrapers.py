@@ -0,0 +1,17 @@
+# scrapers.py
+from functools import cache
+import importlib
+
+# Scraper classes by name, as "module:attribute". A scraper module is only
+# imported the first time that scraper is requested.
+SCRAPERS = {
+  "gematsu": "src.gematsu_scraper:GematsuScraper",
+  "metacritic": "src.metacritic_scraper:MetacriticScraper",
+}
+
+
+@cache
+def get_scraper_class(name: str):
+  """Import and return the scraper class registered under `name`."""
+  module_name, _, attribute = SCRAPERS[name].partition(":")
+  return getattr(importlib.import_module(module_name), attribute)
@@ -0,0 +1,229 @@
+# test_coordination.py
+import logging
+import time
+from datetime import timedelta
+
+import pytest
+
+from benchmarks.fake_mongo import FakeCollection
+from src.coordination import DONE, FAILED, LEASED, PENDING, WorkQueue
+
+# Short enough to keep the suite fast, long enough to not expire mid-step.
+LEASE = 0.2
+
+
+def wait(seconds: float = LEASE):
+  time.sleep(seconds + 0.05)
+
+
+@pytest.fixture
+def collection():
+  return FakeCollection("scrape_queue")
+
+
+def make_queue(collection, worker_id, **kwargs):
+  kwargs.setdefault("lease_seconds", LEASE)
+  kwargs.setdefault("retry_seconds", LEASE)
+  return WorkQueue(collection, worker_id=worker_id, **kwargs)
+
+
+def status(collection, item_id):
+  return collection.find_one({"_id": item_id})["status"]
+
+
+def test_enqueue_is_idempotent(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {"n": 1})
+  queue.enqueue("page", "1", {"n": 2})
+
+  assert collection.count_documents({}) == 1
+  assert collection.find_one({"_id": "page:1"})["payload"] == {"n": 1}
+
+
+def test_claim_leases_item_to_one_worker(collection):
+  a, b = make_queue(collection, "a"), make_queue(collection, "b")
+  a.enqueue("page", "1", {})
+
+  item = a.claim("page")
+
+  assert item["_id"] == "page:1"
+  assert item["status"] == LEASED
+  assert item["lease_owner"] == "a"
+  assert item["attempts"] == 1
+  assert b.claim("page") is None
+
+
+def test_claim_only_returns_requested_kind(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+
+  assert queue.claim("detail") is None
+
+
+def test_expired_lease_is_reclaimed(collection):
+  a, b = make_queue(collection, "a"), make_queue(collection, "b")
+  a.enqueue("page", "1", {})
+  a.claim("page")
+
+  wait()
+  item = b.claim("page")
+
+  assert item["lease_owner"] == "b"
+  assert item["attempts"] == 2
+
+
+def test_complete_after_lost_lease_fails(collection):
+  a, b = make_queue(collection, "a"), make_queue(collection, "b")
+  a.enqueue("page", "1", {})
+  stale = a.claim("page")
+  wait()
+  b.claim("page")
+
+  assert a.complete(stale) is False
+  assert status(collection, "page:1") == LEASED
+  assert collection.find_one({"_id": "page:1"})["lease_owner"] == "b"
+
+
+def test_leased_logs_lost_lease(collection, caplog):
+  a, b = make_queue(collection, "a"), make_queue(collection, "b")
+  a.enqueue("page", "1", {})
+  item = a.claim("page")
+
+  with caplog.at_level(logging.WARNING, logger="src.coordination"):
+    with a.leased(item):
+      wait()
+      b.claim("page")
+
+  assert "page:1" in caplog.text
+
+
+def test_leased_completes_item(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+
+  with queue.leased(queue.claim("page")):
+    pass
+
+  assert status(collection, "page:1") == DONE
+  assert queue.claim("page") is None
+
+
+def test_leased_releases_and_suppresses_exceptions(collection, caplog):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+
+  with caplog.at_level(logging.ERROR, logger="src.coordination"):
+    with queue.leased(queue.claim("page")):
+      raise ValueError("broken page")
+
+  assert status(collection, "page:1") == PENDING
+  assert "broken page" in caplog.text
+
+
+def test_leased_reraises_base_exceptions(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+
+  with pytest.raises(KeyboardInterrupt):
+    with queue.leased(queue.claim("page")):
+      raise KeyboardInterrupt
+
+  assert status(collection, "page:1") == PENDING
+
+
+def test_released_item_goes_to_back_of_queue(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+  queue.enqueue("page", "2", {})
+
+  queue.release(queue.claim("page"))
+
+  assert queue.claim("page")["_id"] == "page:2"
+  assert queue.claim("page")["_id"] == "page:1"
+
+
+def test_claims_stop_at_max_attempts(collection):
+  queue = make_queue(collection, "a", max_attempts=2)
+  queue.enqueue("page", "1", {})
+
+  queue.release(queue.claim("page"))
+  queue.release(queue.claim("page"))
+
+  assert status(collection, "page:1") == FAILED
+  assert queue.claim("page") is None
+  assert queue.dead_items() == ["page:1"]
+
+
+def test_crashed_item_at_max_attempts_is_dead(collection):
+  queue = make_queue(collection, "a", max_attempts=1)
+  queue.enqueue("page", "1", {})
+  queue.claim("page")
+
+  wait()
+
+  assert queue.claim("page") is None
+  assert queue.dead_items("page") == ["page:1"]
+
+
+def test_failed_item_revived_after_retry_seconds(collection):
+  queue = make_queue(collection, "a", max_attempts=1)
+  queue.enqueue("page", "1", {})
+  queue.release(queue.claim("page"))
+
+  queue.enqueue("page", "1", {})
+  assert queue.claim("page") is None
+
+  wait()
+  queue.enqueue("page", "1", {})
+  item = queue.claim("page")
+
+  assert item["_id"] == "page:1"
+  assert item["attempts"] == 1
+  assert queue.dead_items() == []
+
+
+def test_crashed_item_revived_after_retry_seconds(collection):
+  queue = make_queue(collection, "a", max_attempts=1)
+  queue.enqueue("page", "1", {})
+  queue.claim("page")
+
+  wait(2 * LEASE)
+  queue.enqueue("page", "1", {})
+
+  assert queue.claim("page")["_id"] == "page:1"
+
+
+def test_done_item_stays_done_without_reopen_after(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+  queue.complete(queue.claim("page"))
+
+  queue.enqueue("page", "1", {})
+
+  assert queue.claim("page") is None
+
+
+def test_done_item_reopened_after_reopen_after(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+  queue.complete(queue.claim("page"))
+
+  queue.enqueue("page", "1", {}, reopen_after=timedelta(hours=1))
+  assert queue.claim("page") is None
+
+  queue.enqueue("page", "1", {"fresh": True}, reopen_after=timedelta(0))
+  item = queue.claim("page")
+
+  assert item["payload"] == {"fresh": True}
+  assert item["attempts"] == 1
+
+
+def test_reopened_item_goes_to_back_of_queue(collection):
+  queue = make_queue(collection, "a")
+  queue.enqueue("page", "1", {})
+  queue.complete(queue.claim("page"))
+  queue.enqueue("page", "2", {})
+
+  queue.enqueue("page", "1", {}, reopen_after=timedelta(0))
+
+  assert queue.claim("page")["_id"] == "page:2"
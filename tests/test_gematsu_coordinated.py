@@ -0,0 +1,106 @@
+# test_gematsu_coordinated.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from benchmarks.fake_mongo import FakeMongoDB, patch_mongodb
+from benchmarks.stub_server import StubServer
+from benchmarks.synthetic import gematsu_weeks
+from src.coordination import WorkQueue
+from src.dedupe_weeks import dedupe_gematsu_weeks
+from src.gematsu_scraper import DETAIL, GematsuScraper
+
+LISTING_WEEKS = 10
+
+
+@pytest.fixture(scope="module")
+def stub():
+  with StubServer() as server:
+    yield server
+
+
+@pytest.fixture(autouse=True)
+def fake_mongo():
+  FakeMongoDB.reset()
+  with patch_mongodb():
+    yield
+
+
+def make_scraper(stub):
+  scraper = GematsuScraper()
+  scraper.base_url = stub.gematsu_base_url
+  return scraper
+
+
+def make_queue(worker_id="a"):
+  return WorkQueue(FakeMongoDB("scrape_queue").collection, worker_id=worker_id)
+
+
+def stored_weeks():
+  return FakeMongoDB("gematsu_data").collection.count_documents({})
+
+
+def test_writes_every_week_once(stub):
+  scraper = make_scraper(stub)
+
+  assert scraper.scrape_coordinated(make_queue()) == LISTING_WEEKS
+  assert scraper.scrape_coordinated(make_queue()) == 0
+  assert stored_weeks() == LISTING_WEEKS
+
+
+def test_workers_split_backfill_without_duplicates(stub):
+  scrapers = [make_scraper(stub) for _ in range(4)]
+
+  with ThreadPoolExecutor(len(scrapers)) as pool:
+    written = list(
+      pool.map(
+        lambda worker: worker[1].scrape_coordinated(
+          make_queue(f"worker-{worker[0]}"), run_all_pages=True
+        ),
+        enumerate(scrapers),
+      )
+    )
+
+  assert sum(written) == LISTING_WEEKS
+  assert stored_weeks() == LISTING_WEEKS
+
+
+def test_failing_detail_page_does_not_block_the_rest(stub):
+  scraper = make_scraper(stub)
+  get_existing_entries = scraper.get_existing_entries
+  broken_link = scraper.parse_listing(scraper.get_soup(scraper.page_url(1)))[0]["link"]
+
+  def flaky(link, start_date, end_date):
+    if link == broken_link:
+      raise AttributeError("'NoneType' object has no attribute 'find_all'")
+    return get_existing_entries(link, start_date, end_date)
+
+  scraper.get_existing_entries = flaky
+  queue = make_queue()
+
+  assert scraper.scrape_coordinated(queue) == LISTING_WEEKS - 1
+  assert queue.dead_items() == [f"{DETAIL}:{broken_link}"]
+
+
+def test_landing_page_is_rescanned_on_every_call(stub):
+  scraper = make_scraper(stub)
+  scraper.scrape_coordinated(make_queue())
+  newest = scraper.parse_listing(scraper.get_soup(scraper.page_url(1)))[0]
+  FakeMongoDB("gematsu_data").collection.delete_many({"link": newest["link"]})
+
+  assert scraper.scrape_coordinated(make_queue()) == 1
+  assert stored_weeks() == LISTING_WEEKS
+
+
+def test_ensure_indexes_fails_on_duplicates_until_deduped(stub):
+  collection = FakeMongoDB("gematsu_data").collection
+  weeks = gematsu_weeks(3)
+  collection.insert_many([dict(week) for week in weeks + weeks[:2]])
+  scraper = make_scraper(stub)
+
+  with pytest.raises(RuntimeError, match="src.dedupe_weeks"):
+    scraper.ensure_indexes()
+
+  assert dedupe_gematsu_weeks(collection) == 2
+  assert stored_weeks() == 3
+  scraper.ensure_indexes()